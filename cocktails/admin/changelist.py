@@ -0,0 +1,28 @@
+# cocktails/admin/changelist.py
+"""Changelist that loads only the columns its list_display needs, and paging for the big lists."""
+from django.contrib.admin.views.main import ChangeList
+
+
+class NarrowChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        only = getattr(self.model_admin, "list_only", ())
+        return qs.only(*only) if only else qs
+
+
+class ListOnlyMixin:
+    """
+    Set `list_only` to the model fields the changelist reads. Only the list
+    page is narrowed; change forms still load full rows via get_queryset().
+    """
+    list_only = ()
+
+    def get_changelist(self, request, **kwargs):
+        return NarrowChangeList
+
+
+class ShortPagesMixin:
+    """Paging for the big changelists (cocktails, ingredients, summaries)."""
+    # Smaller pages; filtered/searched lists skip the extra unfiltered COUNT(*)
+    list_per_page = 50
+    show_full_result_count = False
@@ -1,78 +1,27 @@
 # cocktails/admin/cocktails.py
+import re
 from decimal import Decimal
 
 from django import forms
 from django.contrib import admin
-from django.utils.html import format_html
+from django.db import IntegrityError, transaction
 from django.utils.text import slugify
 from django.utils import timezone
 
-from ..models import Cocktail, CocktailIngredient, CocktailSummary
+from ..models import Cocktail, CocktailIngredient, CocktailSummary, Ingredient
 from ..forms import CocktailIngredientInlineForm
-
-
-# ---- glass choices resolver (constants-first, robust autodetect, model fallback) ----
-def _is_choices_like(value) -> bool:
-    """Return True if value looks like Django choices: [(value, label), ...]."""
-    if not isinstance(value, (list, tuple)) or not value:
-        return False
-    first = value[0]
-    return isinstance(first, (list, tuple)) and len(first) == 2
-
-def _resolve_glass_choices():
-    """
-    Try to find choices in cocktails/constants.py using several common names.
-    If not present, fall back to model field choices so the admin never shows
-    an empty dropdown.
-    """
-    # 1) constants.py (robust autodetect)
-    try:
-        from .. import constants as _c  # type: ignore
-        # Common names first
-        for name in (
-            "GLASS_CHOICES",
-            "GLASS_TYPE_CHOICES",
-            "GLASS_TYPES",
-            "GLASSES",
-            "GLASS",
-        ):
-            if hasattr(_c, name):
-                val = getattr(_c, name)
-                if _is_choices_like(val):
-                    return list(val)
-
-        # Any variable containing GLASS and CHOICE/TYPES that matches shape
-        for name in dir(_c):
-            up = name.upper()
-            if "GLASS" in up and ("CHOICE" in up or "TYPE" in up or "TYPES" in up):
-                val = getattr(_c, name)
-                if _is_choices_like(val):
-                    return list(val)
-    except Exception:
-        pass
-
-    # 2) Fallback: read choices off model fields
-    try:
-        field = Cocktail._meta.get_field("glass_type")
-        if getattr(field, "choices", None):
-            return list(field.choices)
-    except Exception:
-        pass
-    try:
-        field = CocktailSummary._meta.get_field("glass_type")
-        if getattr(field, "choices", None):
-            return list(field.choices)
-    except Exception:
-        pass
-
-    # 3) Last resort: empty list (safe; renders an empty select without crashing)
-    return []
-
-GLASS_CHOICES_RESOLVED = _resolve_glass_choices()
+from .changelist import ListOnlyMixin, ShortPagesMixin
+from .glass_choices import glass_type_field
+from .images import list_thumb, preview
 
 
 # --- helpers ---------------------------------------------------------------
 
+_ZERO = Decimal("0")
+# unit -> size of one oz in that unit; dividing keeps ml results identical
+# to the old `amt / 29.5735`
+_UNITS_PER_OZ = {"oz": Decimal("1"), "ml": Decimal("29.5735")}
+
 def _to_oz(amount, unit):
     """
     Minimal conversion used in your earlier fixes:
@@ -81,25 +30,20 @@ def _to_oz(amount, unit):
       - everything else -> 0 to avoid guessing
     """
     if amount is None:
-        return Decimal("0")
-    unit = (unit or "").lower()
-    amt = Decimal(str(amount))
-    if unit == "oz":
-        return amt
-    if unit == "ml":
-        return amt / Decimal("29.5735")
-    return Decimal("0")
+        return _ZERO
+    per_oz = _UNITS_PER_OZ.get((unit or "").lower())
+    if per_oz is None:
+        return _ZERO
+    # amount_input is a DecimalField, so the str() round-trip is rarely needed
+    amt = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    return amt / per_oz
 
 
 # --- admin forms -----------------------------------------------------------
 
 class CocktailAdminForm(forms.ModelForm):
     # Make it a dropdown; source from constants (or model choices fallback)
-    glass_type = forms.ChoiceField(
-        choices=GLASS_CHOICES_RESOLVED,
-        required=False,
-        label="Glass type",
-    )
+    glass_type = glass_type_field(required=False, label="Glass type")
 
     class Meta:
         model = Cocktail
@@ -123,18 +67,40 @@ class CocktailIngredientInline(admin.TabularInline):
     # Keep working behavior: amount_oz is not edited directly
     fields = ("seq", "ingredient", "amount_input", "unit_input", "prep_note", "is_optional")
     ordering = ("seq",)
+    # AJAX search (IngredientAdmin.search_fields) instead of a full <select> per row
+    autocomplete_fields = ("ingredient",)
     verbose_name = "Cocktail ingredient"
     verbose_name_plural = "Cocktail ingredients"
 
+    def get_queryset(self, request):
+        # The joined ingredient only feeds its __str__ label; skip notes etc.
+        return (
+            super().get_queryset(request)
+            .select_related("ingredient")
+            .only("id", "cocktail_id", "seq", "ingredient__name", "amount_input",
+                  "unit_input", "amount_oz", "prep_note", "is_optional")
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Selected-option labels and validation only need Ingredient.__str__ (name)
+        if db_field.name == "ingredient":
+            kwargs["queryset"] = Ingredient.objects.only("id", "name")
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 
 # --- admin -----------------------------------------------------------------
 
 @admin.register(Cocktail)
-class CocktailAdmin(admin.ModelAdmin):
+class CocktailAdmin(ShortPagesMixin, ListOnlyMixin, admin.ModelAdmin):
     form = CocktailAdminForm  # apply Glass dropdown
     inlines = [CocktailIngredientInline]
 
     list_display = ("name", "status", "price_column", "abv_column", "image_list")
+    # One LEFT JOIN to cocktail_summary_v for the price/ABV columns
+    list_select_related = ("summary",)
+    # changelist skips story_long and the other text columns
+    list_only = ("id", "name", "status", "image_url",
+                 "summary__price_suggested", "summary__abv_percent")
     search_fields = ("name", "slug")
     ordering = ("name",)
     prepopulated_fields = {"slug": ("name",)}
@@ -146,6 +112,13 @@ class CocktailAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("image_preview", "price_auto", "created_at", "updated_at")
 
+    def _summary_value(self, obj: Cocktail, field: str):
+        """Summary view column; the changelist joins the row via list_select_related."""
+        try:
+            return getattr(obj.summary, field)
+        except CocktailSummary.DoesNotExist:
+            return None
+
     # ---------- persistence hooks ----------
     def save_formset(self, request, form, formset, change):
         """
@@ -155,23 +128,40 @@ class CocktailAdmin(admin.ModelAdmin):
         instances = formset.save(commit=False)
         for obj in instances:
             obj.amount_oz = _to_oz(obj.amount_input, getattr(obj, "unit_input", None))
-            obj.save()
-        # handle deletes & m2m
-        for obj in formset.deleted_objects:
-            obj.delete()
+
+        # One INSERT for new lines and one UPDATE for edited ones instead of
+        # a save() per row
+        model = formset.model
+        new = [obj for obj in instances if obj.pk is None]
+        existing = [obj for obj in instances if obj.pk is not None]
+        if new:
+            model.objects.bulk_create(new)
+        if existing:
+            concrete = {f.name for f in model._meta.concrete_fields}
+            changed = {name for _, names in formset.changed_objects for name in names}
+            model.objects.bulk_update(existing, sorted((changed & concrete) | {"amount_oz"}))
+        # handle deletes (one DELETE ... WHERE id IN) & m2m
+        if formset.deleted_objects:
+            model.objects.filter(pk__in=[obj.pk for obj in formset.deleted_objects]).delete()
         formset.save_m2m()
 
     def _ensure_unique_slug(self, base: str, *, instance_id=None) -> str:
-        s = slugify(base) or "item"
-        orig = s
-        i = 2
-        qs = Cocktail.objects.all()
+        orig = slugify(base) or "item"
+        # One query for the base slug and its numbered variants only. Match and
+        # compare case-insensitively, as the unique index does (_ci collation);
+        # MySQL's REGEXP on its own would be binary and miss "Mojito"
+        qs = Cocktail.objects.filter(slug__iregex=rf"^{re.escape(orig)}(-[0-9]+)?$")
         if instance_id:
             qs = qs.exclude(pk=instance_id)
-        while qs.filter(slug=s).exists():
-            s = f"{orig}-{i}"
-            i += 1
-        return s
+        taken = {t.lower() for t in qs.values_list("slug", flat=True)}
+        if orig not in taken:
+            return orig
+        # first free number from 2, as the old exists() probe picked, so a
+        # slug like "mojito-2024" doesn't push the next one to 2025
+        n = 2
+        while f"{orig}-{n}" in taken:
+            n += 1
+        return f"{orig}-{n}"
 
     def save_model(self, request, obj, form, change):
         # Ensure slug and timestamps (kept from your code)
@@ -181,35 +171,38 @@ class CocktailAdmin(admin.ModelAdmin):
         if not obj.created_at:
             obj.created_at = now
         obj.updated_at = now
-        super().save_model(request, obj, form, change)
+        # validate_unique can pass for two concurrent saves of the same slug; the
+        # unique index decides. Only a slug clash is retried, with the next free one.
+        try:
+            with transaction.atomic():
+                super().save_model(request, obj, form, change)
+        except IntegrityError:
+            if not Cocktail.objects.filter(slug=obj.slug).exclude(pk=obj.pk).exists():
+                raise
+            obj.slug = self._ensure_unique_slug(obj.slug, instance_id=obj.pk)
+            with transaction.atomic():
+                super().save_model(request, obj, form, change)
 
     # ---------- UI helpers ----------
     @admin.display(description="Preview")
     def image_preview(self, obj: Cocktail):
-        url = obj.image_url or ""
-        return (
-            format_html('<img src="{}" style="height:110px;width:auto;border-radius:6px;" />', url)
-            if url else format_html('<div style="opacity:.5">No image</div>')
-        )
+        return preview(obj.image_url)
 
     @admin.display(description="PRICE")
     def price_column(self, obj: Cocktail):
-        s = CocktailSummary.objects.filter(pk=obj.pk).only("price_suggested").first()
-        return "—" if not s or s.price_suggested is None else f"{s.price_suggested:.2f}"
+        v = self._summary_value(obj, "price_suggested")
+        return "—" if v is None else f"{v:.2f}"
 
     @admin.display(description="ABV %")
     def abv_column(self, obj: Cocktail):
-        s = CocktailSummary.objects.filter(pk=obj.pk).only("abv_percent").first()
-        return "—" if not s or s.abv_percent is None else f"{s.abv_percent:.2f}"
+        v = self._summary_value(obj, "abv_percent")
+        return "—" if v is None else f"{v:.2f}"
 
     @admin.display(description="Price (auto)")
     def price_auto(self, obj: Cocktail):
-        s = CocktailSummary.objects.filter(pk=obj.pk).only("price_suggested").first()
-        return "—" if not s or s.price_suggested is None else f"{s.price_suggested:.2f}"
+        v = self._summary_value(obj, "price_suggested")
+        return "—" if v is None else f"{v:.2f}"
 
     @admin.display(description="IMAGE")
     def image_list(self, obj: Cocktail):
-        return (
-            format_html('<img src="{}" style="height:18px;width:auto;border-radius:3px;" />', obj.image_url)
-            if obj.image_url else "—"
-        )
+        return list_thumb(obj.image_url)
@@ -0,0 +1,10 @@
+# cocktails/admin/glass_choices.py
+"""Glass-type choices shared by the Cocktail and CocktailSummary admin forms."""
+from django import forms
+
+from ..constants import GLASS_TYPE_CHOICES
+
+
+def glass_type_field(**kwargs):
+    """Glass dropdown sourced from the canonical list in cocktails/constants.py."""
+    return forms.ChoiceField(choices=GLASS_TYPE_CHOICES, **kwargs)
@@ -1,19 +1,21 @@
 # cocktails/admin/ingredients.py
 from django import forms
 from django.contrib import admin
-from django.utils.html import format_html
 
 from ..models import Ingredient
 from ..forms import IngredientAdminForm
+from .changelist import ListOnlyMixin, ShortPagesMixin
+from .images import list_thumb
 
 
 @admin.register(Ingredient)
-class IngredientAdmin(admin.ModelAdmin):
+class IngredientAdmin(ShortPagesMixin, ListOnlyMixin, admin.ModelAdmin):
     form = IngredientAdminForm
 
     # Changelist columns (no "is_housemade")
     list_display = ("id", "name", "type", "abv_percent", "cost_per_oz_2dp", "image_column")
     list_display_links = ("id", "name")
+    list_only = ("id", "name", "type", "abv_percent", "cost_per_oz", "image_url")
     search_fields = ("name",)
 
     # ✅ bring back the filter by ingredient type
@@ -36,11 +38,8 @@ class IngredientAdmin(admin.ModelAdmin):
     @admin.display(description="COST PER OZ")
     def cost_per_oz_2dp(self, obj: Ingredient):
         v = getattr(obj, "cost_per_oz", None)
-        return "" if v is None else f"{float(v):.2f}"
+        return "" if v is None else format(v, ".2f")
 
     @admin.display(description="IMAGE")
     def image_column(self, obj: Ingredient):
-        return (
-            format_html('<img src="{}" style="height:18px;width:auto;border-radius:3px;" />', obj.image_url)
-            if obj.image_url else "—"
-        )
+        return list_thumb(obj.image_url)
@@ -1,9 +1,17 @@
 # cocktails/admin/metrics.py
 from decimal import Decimal, ROUND_HALF_UP
 
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+from django.db.models.functions import Coalesce, Lower
+
 OZ_PER_ML = Decimal("0.0338140227")
+# unit -> oz multiplier; units not listed pass through as already-in-oz
+_UNIT_FACTORS = {"oz": Decimal("1"), "ounce": Decimal("1"), "ounces": Decimal("1"), "ml": OZ_PER_ML}
+_ONE = Decimal("1")
 
 def _to_decimal(v):
+    if isinstance(v, Decimal):
+        return v
     try:
         return Decimal(str(v))
     except Exception:
@@ -20,54 +28,61 @@ def _to_oz(amount_input, unit_input, amount_oz_db):
         return amt_oz
 
     amt_in = _to_decimal(amount_input)
-    unit = (unit_input or "").lower()
+    # Fallback: treat as already-in-oz; this preserves current behavior for custom units.
+    factor = _UNIT_FACTORS.get((unit_input or "").lower(), _ONE)
+    return amt_in if factor == _ONE else amt_in * factor
 
-    if unit in ("oz", "ounce", "ounces"):
-        return amt_in
-    if unit == "ml":
-        return (amt_in * OZ_PER_ML)
+_OZ_FIELD = DecimalField(max_digits=20, decimal_places=10)
 
-    # Fallback: treat as already-in-oz; this preserves current behavior for custom units.
-    return amt_in
+def _line_oz():
+    """SQL twin of _to_oz: saved amount_oz when positive, else amount_input by unit."""
+    amt_in = Coalesce("amount_input", Value(Decimal("0")), output_field=_OZ_FIELD)
+    return Case(
+        When(amount_oz__gt=0, then=F("amount_oz")),
+        *(When(unit_lc=unit, then=amt_in * Value(factor))
+          for unit, factor in _UNIT_FACTORS.items() if factor != _ONE),
+        # oz/ounce/ounces and custom units all pass the raw value through
+        default=amt_in,
+        output_field=_OZ_FIELD,
+    )
 
-def compute_price_and_abv(cocktail):
+def compute_price_and_abv(cocktail, *, quantize=True):
     """
     Compute (price, abv_percent) from the current DB state for a Cocktail object.
     Works even immediately after creation, without relying on DB views or cached columns.
+    One aggregate query; lines with no volume are skipped, as are non-positive ABV/cost.
+    quantize=False returns the unrounded Decimals for callers doing further math.
     """
-    total_oz = Decimal("0")
-    pure_alc_oz = Decimal("0")
-    total_cost = Decimal("0")
-
     # Avoid circular import at module import time
     from cocktails.models import CocktailIngredient
 
-    qs = (
+    agg = (
         CocktailIngredient.objects
-        .select_related("ingredient")
         .filter(cocktail_id=cocktail.pk)
+        .alias(unit_lc=Lower("unit_input"))
+        .annotate(oz=_line_oz())
+        .filter(oz__gt=0)
+        .aggregate(
+            total_oz=Sum("oz"),
+            pure_alc_oz=Sum(Case(
+                # * 0.01, not / 100: SQLite divides whole-number operands as integers
+                When(ingredient__abv_percent__gt=0,
+                     then=F("oz") * F("ingredient__abv_percent") * Value(Decimal("0.01"))),
+                output_field=_OZ_FIELD,
+            )),
+            total_cost=Sum(Case(
+                When(ingredient__cost_per_oz__gt=0, then=F("oz") * F("ingredient__cost_per_oz")),
+                output_field=_OZ_FIELD,
+            )),
+        )
     )
-
-    for ci in qs:
-        oz = _to_oz(ci.amount_input, ci.unit_input, ci.amount_oz)
-        if oz <= 0:
-            continue
-
-        total_oz += oz
-
-        ing = ci.ingredient
-        if ing:
-            # ABV
-            abv = _to_decimal(getattr(ing, "abv_percent", 0))
-            if abv > 0:
-                pure_alc_oz += oz * (abv / Decimal("100"))
-
-            # Cost
-            cpo = _to_decimal(getattr(ing, "cost_per_oz", 0))
-            if cpo > 0:
-                total_cost += oz * cpo
+    total_oz = _to_decimal(agg["total_oz"] or 0)
+    pure_alc_oz = _to_decimal(agg["pure_alc_oz"] or 0)
+    total_cost = _to_decimal(agg["total_cost"] or 0)
 
     abv_pct = Decimal("0") if total_oz == 0 else (pure_alc_oz / total_oz * Decimal("100"))
+    if not quantize:
+        return total_cost, abv_pct
     # Round for display, not storage
     total_cost = total_cost.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
     abv_pct = abv_pct.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
@@ -1,62 +1,32 @@
-# cocktails/admin/cocktail_summaries.py
+# cocktails/admin/summaries.py
 from django import forms
 from django.contrib import admin, messages
 
 from ..models import CocktailSummary, Cocktail
-
-
-# ---- glass choices resolver (constants-first, robust autodetect, model fallback)
-def _is_choices_like(value) -> bool:
-    if not isinstance(value, (list, tuple)) or not value:
-        return False
-    first = value[0]
-    return isinstance(first, (list, tuple)) and len(first) == 2
-
-def _resolve_glass_choices():
-    # 1) constants.py with common names and shape check
-    try:
-        from .. import constants as _c  # type: ignore
-        for name in (
-            "GLASS_CHOICES",
-            "GLASS_TYPE_CHOICES",
-            "GLASS_TYPES",
-            "GLASSES",
-            "GLASS",
-        ):
-            if hasattr(_c, name):
-                val = getattr(_c, name)
-                if _is_choices_like(val):
-                    return list(val)
-        for name in dir(_c):
-            up = name.upper()
-            if "GLASS" in up and ("CHOICE" in up or "TYPE" in up or "TYPES" in up):
-                val = getattr(_c, name)
-                if _is_choices_like(val):
-                    return list(val)
-    except Exception:
-        pass
-    # 2) fallback to model field choices
-    try:
-        field = CocktailSummary._meta.get_field("glass_type")
-        if getattr(field, "choices", None):
-            return list(field.choices)
-    except Exception:
-        pass
-    return []
-
-GLASS_CHOICES_RESOLVED = _resolve_glass_choices()
-
+from .changelist import ListOnlyMixin, ShortPagesMixin
+from .glass_choices import glass_type_field
+
+# Shared by the form's Meta and the admin layout so the two can't drift
+SUMMARY_FIELDS = (
+    "name",
+    "slug",
+    "description_short",
+    "flavor_scale",
+    "glass_type",
+    "invention_year",
+    "price_suggested",
+    "abv_percent",
+    "story_long",
+    "time_to_make_sec",
+    "allergens_json",
+)
 
 class CocktailSummaryAdminForm(forms.ModelForm):
     """
     Editable form with all fields optional.
     Ensures Price suggested renders with EXACTLY 2 decimals.
     """
-    glass_type = forms.ChoiceField(
-        choices=GLASS_CHOICES_RESOLVED,
-        required=False,
-        label="Glass type",
-    )
+    glass_type = glass_type_field(required=False, label="Glass type")
     price_suggested = forms.DecimalField(
         required=False,
         decimal_places=2,   # <-- 2dp in the form
@@ -66,39 +36,23 @@ class CocktailSummaryAdminForm(forms.ModelForm):
 
     class Meta:
         model = CocktailSummary
-        fields = [
-            "name",
-            "slug",
-            "description_short",
-            "flavor_scale",
-            "glass_type",
-            "invention_year",
-            "price_suggested",
-            "abv_percent",
-            "story_long",
-            "time_to_make_sec",
-            "allergens_json",
-        ]
+        fields = SUMMARY_FIELDS
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Make every field non-required so Save works even when empty
-        for f in self.fields.values():
-            f.required = False
-
         # Force 2-decimal display and step on the widget
         if "price_suggested" in self.fields:
             self.fields["price_suggested"].widget.attrs.update({"step": "0.01"})
             v = getattr(self.instance, "price_suggested", None)
             if v is not None:
                 try:
-                    self.initial["price_suggested"] = f"{float(v):.2f}"
+                    self.initial["price_suggested"] = format(v, ".2f")
                 except Exception:
                     pass
 
 
 @admin.register(CocktailSummary)
-class CocktailSummaryAdmin(admin.ModelAdmin):
+class CocktailSummaryAdmin(ShortPagesMixin, ListOnlyMixin, admin.ModelAdmin):
     """
     Summary admin remains editable. Save will NOT write to the view (non-updatable);
     instead we proxy allowed fields to the upstream Cocktail row.
@@ -107,27 +61,25 @@ class CocktailSummaryAdmin(admin.ModelAdmin):
     form = CocktailSummaryAdminForm
 
     list_display = ("name", "price_suggested_2dp", "abv_percent", "glass_type")
+    # The view has no FKs to join; just skip story_long/allergens_json etc.
+    list_only = ("cocktail", "name", "price_suggested", "abv_percent", "glass_type")
     search_fields = ("name", "slug")
     ordering = ("name",)
 
-    fields = [
-        "name",
-        "slug",
-        "description_short",
-        "flavor_scale",
-        "glass_type",
-        "invention_year",
-        "price_suggested",
-        "abv_percent",
-        "story_long",
-        "time_to_make_sec",
-        "allergens_json",
-    ]
+    fields = SUMMARY_FIELDS
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        # Every model field is optional so Save works even when empty; runs once
+        # per form class (get_form), not per form instance
+        formfield = super().formfield_for_dbfield(db_field, request, **kwargs)
+        if formfield is not None:
+            formfield.required = False
+        return formfield
 
     @admin.display(description="PRICE SUGGESTED")
     def price_suggested_2dp(self, obj: CocktailSummary):
         v = getattr(obj, "price_suggested", None)
-        return "" if v is None else f"{float(v):.2f}"
+        return "" if v is None else format(v, ".2f")
 
     def save_model(self, request, obj, form, change):
         """
@@ -136,13 +88,10 @@ class CocktailSummaryAdmin(admin.ModelAdmin):
         """
         glass_val = form.cleaned_data.get("glass_type", None)
 
-        # Update the upstream Cocktail (same PK as summary)
-        try:
-            cock = Cocktail.objects.get(pk=obj.pk)
-            cock.glass_type = glass_val or None
-            cock.save(update_fields=["glass_type"])
+        # Update the upstream Cocktail (same PK as summary) in one UPDATE
+        if Cocktail.objects.filter(pk=obj.pk).update(glass_type=glass_val or None):
             messages.success(request, "Glass type updated on Cocktail.")
-        except Cocktail.DoesNotExist:
+        else:
             messages.error(request, "Linked Cocktail not found; cannot update glass type.")
 
         # Never call super().save_model(...) — avoids UPDATE on VIEW
@@ -36,4 +36,10 @@ GLASS_TYPE_CHOICES = [
 
 DEFAULT_GLASS_TYPE = "Highball"
 
-__all__ = ["NO_IMAGE_URL", "GLASS_TYPE_CHOICES", "DEFAULT_GLASS_TYPE"]
+# Units the ingredient inline accepts when the model defines no unit choices
+UNIT_CHOICES = (
+    ("oz", "oz"),
+    ("ml", "ml"),
+)
+
+__all__ = ["NO_IMAGE_URL", "GLASS_TYPE_CHOICES", "DEFAULT_GLASS_TYPE", "UNIT_CHOICES"]
@@ -4,13 +4,15 @@ from __future__ import annotations
 from django import forms
 from django.core.exceptions import ValidationError
 
+from .constants import UNIT_CHOICES
 from .models import Ingredient, CocktailIngredient
 
 
 def _unit_choices():
     """
     Pull choices from the model in one place.
-    Works with TextChoices (Unit.choices) or legacy UNIT_CHOICES.
+    Works with TextChoices (Unit.choices) or legacy UNIT_CHOICES on the model,
+    else the shared constants.UNIT_CHOICES.
     """
     unit_enum = getattr(CocktailIngredient, "Unit", None)
     if unit_enum and hasattr(unit_enum, "choices"):
@@ -21,7 +23,11 @@ def _unit_choices():
         return list(legacy)
 
     # Fallback so admin never breaks (will be overwritten by real choices in model)
-    return [("oz", "oz"), ("ml", "ml")]
+    return list(UNIT_CHOICES)
+
+_UNIT_CHOICES = _unit_choices()
+# Valid unit keys; built once instead of per form instance
+_UNIT_VALID = frozenset(k for k, _ in _UNIT_CHOICES)
 
 
 class IngredientAdminForm(forms.ModelForm):
@@ -43,7 +49,7 @@ class CocktailIngredientInlineForm(forms.ModelForm):
     Critical: keep unit_input a ChoiceField (dropdown), not a text box.
     """
     unit_input = forms.ChoiceField(
-        choices=_unit_choices(),
+        choices=_UNIT_CHOICES,
         required=True,
         label="Unit input",
     )
@@ -58,31 +64,30 @@ class CocktailIngredientInlineForm(forms.ModelForm):
             "prep_note",
             "is_optional",
         ]
+        widgets = {"amount_input": forms.NumberInput(attrs={"style": "width:120px"})}
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["amount_input"].widget.attrs.setdefault("style", "width:120px")
 
         # Edit case: show current value
         if getattr(self.instance, "unit_input", None):
             self.fields["unit_input"].initial = self.instance.unit_input
             return
 
-        # Optional default from Ingredient if your model exposes it
+        # Optional default from Ingredient if your model exposes it; only read an
+        # already-loaded ingredient so a bare row doesn't cost a SELECT
         ing: Ingredient | None = (
             self.instance.ingredient
-            if getattr(self.instance, "ingredient_id", None)
+            if CocktailIngredient.ingredient.is_cached(self.instance)
             else None
         )
         default_from_ing = getattr(ing, "default_unit", None)
         if default_from_ing:
-            valid = {c[0] for c in self.fields["unit_input"].choices}
-            if default_from_ing in valid:
+            if default_from_ing in _UNIT_VALID:
                 self.fields["unit_input"].initial = default_from_ing
 
     def clean_unit_input(self):
         val = self.cleaned_data.get("unit_input")
-        valid = {c[0] for c in self.fields["unit_input"].choices}
-        if val not in valid:
+        if val not in _UNIT_VALID:
             raise ValidationError("Select a valid unit.")
         return val
@@ -1,8 +1,13 @@
 from decimal import Decimal
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
 from cocktails.models import CocktailIngredient
 
 
+ML_PER_OZ = Decimal("29.5735")
+
+
 def to_oz(amount, unit):
     if amount is None:
         return Decimal("0")
@@ -11,7 +16,7 @@ def to_oz(amount, unit):
     if unit == "oz":
         return amt
     if unit == "ml":
-        return amt / Decimal("29.5735")
+        return amt / ML_PER_OZ
     return Decimal("0")
 
 
@@ -19,11 +24,28 @@ class Command(BaseCommand):
     help = "Backfill CocktailIngredient.amount_oz from amount_input + unit_input"
 
     def handle(self, *args, **options):
-        updated = 0
-        for ci in CocktailIngredient.objects.all():
-            new_val = to_oz(ci.amount_input, getattr(ci, "unit_input", None))
-            if ci.amount_oz != new_val:
-                ci.amount_oz = new_val
-                ci.save(update_fields=["amount_oz"])
-                updated += 1
+        # Same rule as to_oz: oz and unknown units as set-based UPDATEs that only
+        # touch rows whose stored value differs. ml rows are converted here rather
+        # than with SQL ROUND, which rounds ties away from zero where the admin's
+        # save stores amount_oz rounded half-even; both paths must agree.
+        lines = CocktailIngredient.objects
+        with transaction.atomic():
+            updated = (
+                lines.filter(unit_input__iexact="oz")
+                .exclude(amount_oz=F("amount_input"))
+                .update(amount_oz=F("amount_input"))
+            )
+            changed = []
+            for line in lines.filter(unit_input__iexact="ml").only("id", "amount_input", "unit_input", "amount_oz"):
+                amount_oz = to_oz(line.amount_input, line.unit_input).quantize(Decimal("0.0001"))
+                if line.amount_oz != amount_oz:
+                    line.amount_oz = amount_oz
+                    changed.append(line)
+            lines.bulk_update(changed, ["amount_oz"], batch_size=500)
+            updated += len(changed)
+            updated += (
+                lines.exclude(Q(unit_input__iexact="oz") | Q(unit_input__iexact="ml"))
+                .exclude(amount_oz=0)
+                .update(amount_oz=Decimal("0"))
+            )
         self.stdout.write(self.style.SUCCESS(f"Updated rows: {updated}"))
@@ -0,0 +1,215 @@
+# cocktails/management/commands/seed_blow_job.py
+from collections import namedtuple
+from decimal import Decimal
+from functools import cache
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.db.models import (
+    IntegerField, FloatField, DecimalField, BooleanField, CharField, TextField,
+    ForeignKey, DateTimeField, DateField, TimeField
+)
+
+APP = "cocktails"
+ML_PER_OZ = Decimal("29.5735")
+
+BLOW_JOB_IMG = "https://res.cloudinary.com/dau9qbp3l/image/upload/v1754790155/blow_job-master.jpg"
+INGR_IMG = {
+    "Amaretto": "https://res.cloudinary.com/dau9qbp3l/image/upload/v1754790212/amaretto_liqueur-master.webp",
+    "Irish Cream Liqueur": "https://res.cloudinary.com/dau9qbp3l/image/upload/v1754790215/irish_cream_liqueur-master.webp",
+    "Whipped Cream": "https://res.cloudinary.com/dau9qbp3l/image/upload/v1754790221/whipped-cream-master.webp",
+}
+
+_app = apps.get_app_config(APP)
+Ingredient = _app.get_model("Ingredient")
+Cocktail   = _app.get_model("Cocktail")
+
+# -------- locate through model (on first run, not at import) --------
+@cache
+def find_through_model():
+    for m in apps.get_models():
+        targets = {f.related_model for f in m._meta.concrete_fields if f.many_to_one}
+        if Cocktail in targets and Ingredient in targets:
+            return m
+    raise RuntimeError("No through model linking Cocktail and Ingredient found.")
+
+# -------- locate Units model (db_table='units') anywhere --------
+@cache
+def _find_unit():
+    try:
+        return _app.get_model("Unit")
+    except LookupError:
+        pass
+    for m in apps.get_models():
+        if m._meta.db_table == "units" or m.__name__ in ("Unit", "Units"):
+            return m
+    raise RuntimeError("Units model (db_table='units') not found.")
+
+@cache
+def field_names(model):
+    return frozenset(f.name for f in model._meta.concrete_fields)
+
+def first_existing(model, candidates):
+    fns = field_names(model)
+    for c in candidates:
+        if c in fns:
+            return c
+    return None
+
+# -------- field mapping, resolved once on first use --------
+# amount_input is this schema's name; the amounts below are ml (unit_input)
+AMOUNT_FIELDS = ["amount_ml","amount","quantity_ml","quantity","volume_ml","ml","amount_input"]
+
+Schema = namedtuple("Schema", [
+    "cocktail_image_field", "ingredient_image_field", "amount_field",
+    "is_garnish_field", "unit_field", "unit_targets_name",
+])
+
+@cache
+def _resolve_schema():
+    Through = find_through_model()
+    image_candidates = ["image_url","photo_url","image","photo","picture_url","thumbnail","thumbnail_url"]
+    # detect unit FK field on through model
+    unit_field = first_existing(Through, ["unit_input","unit","input_unit","measure_unit"])
+    unit_fk = getattr(Through, unit_field).field if unit_field else None
+    return Schema(
+        cocktail_image_field   = first_existing(Cocktail,   image_candidates),
+        ingredient_image_field = first_existing(Ingredient, image_candidates),
+        amount_field           = first_existing(Through,    AMOUNT_FIELDS),
+        is_garnish_field       = first_existing(Through,    ["is_garnish","garnish","is_optional"]),
+        unit_field             = unit_field,
+        unit_targets_name      = isinstance(unit_fk, ForeignKey) and getattr(unit_fk.target_field, "name", None) == "name",
+    )
+
+# ---- NOT NULL defaults for Cocktail ----
+# field class -> default factory; subclasses resolve through their MRO
+_DEFAULTS = {
+    IntegerField:  lambda: 0,
+    BooleanField:  lambda: False,
+    FloatField:    lambda: 0.0,
+    DecimalField:  lambda: Decimal("0"),
+    CharField:     lambda: "",
+    TextField:     lambda: "",
+    DateTimeField: timezone.now,
+    DateField:     timezone.localdate,
+    TimeField:     lambda: timezone.now().time(),
+}
+
+def default_for_field(f):
+    if f.has_default():
+        try:
+            return f.get_default()
+        except Exception:
+            pass
+    for cls in type(f).__mro__:
+        factory = _DEFAULTS.get(cls)
+        if factory is not None:
+            return factory()
+    return None
+
+def build_required_defaults_for_cocktail():
+    required, missing = {}, []
+    for f in Cocktail._meta.concrete_fields:
+        if f.auto_created: continue
+        if f.name in ("id", "name"): continue
+        if getattr(f, "null", True) is False and not f.has_default():
+            if isinstance(f, ForeignKey):
+                rel = f.remote_field.model
+                pk = rel.objects.order_by("pk").values_list("pk", flat=True).first()
+                if pk is not None: required[f.name + "_id"] = pk
+                else:              missing.append(f"{f.name} -> {rel.__name__}")
+            else:
+                dv = default_for_field(f)
+                if dv is None: missing.append(f"{f.name} (no default)")
+                else:          required[f.name] = dv
+    return required, missing
+
+def upsert_kwargs(unique_fields, update_fields):
+    """bulk_create() kwargs for an INSERT ... ON CONFLICT/DUPLICATE KEY upsert."""
+    if not update_fields:
+        return {"ignore_conflicts": True}
+    kwargs = {"update_conflicts": True, "update_fields": update_fields}
+    # MySQL/TiDB match on any unique key and reject an explicit conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        kwargs["unique_fields"] = unique_fields
+    return kwargs
+
+@transaction.atomic(savepoint=False)
+def upsert_blow_job():
+    Through, Unit = find_through_model(), _find_unit()
+    schema = _resolve_schema()
+    ingredient_image_field = schema.ingredient_image_field
+    cocktail_image_field = schema.cocktail_image_field
+    amount_field, is_garnish_field = schema.amount_field, schema.is_garnish_field
+    unit_field, unit_targets_name = schema.unit_field, schema.unit_targets_name
+    if not amount_field:
+        raise CommandError(f"No amount field on {Through.__name__}; expected one of: {', '.join(AMOUNT_FIELDS)}")
+
+    # ensure 'ml' unit exists (string PK or normal PK both OK)
+    ml_unit, _ = Unit.objects.get_or_create(name="ml")
+
+    # 1) ingredients: one upsert for all three, then one fetch
+    names = ("Amaretto", "Irish Cream Liqueur", "Whipped Cream")
+    image_fields = [ingredient_image_field] if ingredient_image_field else []
+    Ingredient.objects.bulk_create(
+        [Ingredient(name=n, **{f: INGR_IMG[n] for f in image_fields}) for n in names],
+        **upsert_kwargs(["name"], image_fields),
+    )
+    ings = Ingredient.objects.in_bulk(names, field_name="name")
+    amaretto, irish_cream, whipped_cream = (ings[n] for n in names)
+
+    # 2) cocktail
+    bj = Cocktail.objects.filter(name="Blow Job").first()
+    if not bj:
+        defaults, missing = build_required_defaults_for_cocktail()
+        if cocktail_image_field: defaults[cocktail_image_field] = BLOW_JOB_IMG
+        if missing:
+            raise RuntimeError("Cannot auto-create Cocktail; required fields need values: " + ", ".join(missing))
+        bj = Cocktail.objects.create(name="Blow Job", **defaults)
+    else:
+        if cocktail_image_field and getattr(bj, cocktail_image_field, None) != BLOW_JOB_IMG:
+            setattr(bj, cocktail_image_field, BLOW_JOB_IMG)
+            bj.save(update_fields=[cocktail_image_field])
+
+    # 3) links (amount + garnish + unit='ml') in one upsert; existing rows keep
+    # their seq so they hit the same unique key instead of being duplicated
+    seq_field = "seq" if "seq" in field_names(Through) else None
+    seqs = dict(Through.objects.filter(cocktail=bj).values_list("ingredient_id", seq_field)) if seq_field else {}
+    unit_fk = unit_field and isinstance(Through._meta.get_field(unit_field), ForeignKey)
+    # the stored ounces the pricing/summary math reads; the admin fills it on save
+    oz_field = "amount_oz" if "amount_oz" in field_names(Through) and amount_field != "amount_oz" else None
+
+    def link(ing, amount_ml, garnish=False):
+        values = {}
+        if seq_field and ing.pk in seqs: values[seq_field] = seqs[ing.pk]
+        values[amount_field] = Decimal(str(amount_ml))
+        if oz_field: values[oz_field] = (Decimal(str(amount_ml)) / ML_PER_OZ).quantize(Decimal("0.0001"))
+        if is_garnish_field is not None: values[is_garnish_field] = bool(garnish)
+        if unit_field:
+            if unit_targets_name:
+                # FK targets Units.name (string PK) → assign "<field>_id" to "ml"
+                values[unit_field + "_id"] = "ml"
+            else:
+                values[unit_field] = ml_unit if unit_fk else ml_unit.pk
+        return Through(cocktail=bj, ingredient=ing, **values)
+
+    unique_fields = next((list(u) for u in Through._meta.unique_together
+                          if {"cocktail", "ingredient"} <= set(u)), ["cocktail", "ingredient"])
+    Through.objects.bulk_create(
+        [link(amaretto, 15, garnish=False),
+         link(irish_cream, 15, garnish=False),
+         link(whipped_cream, 5, garnish=True)],
+        **upsert_kwargs(unique_fields, [f for f in (amount_field, oz_field, is_garnish_field, unit_field) if f]),
+    )
+
+    return {"through_model": Through.__name__,
+            "used_fields": schema._asdict()}
+
+
+class Command(BaseCommand):
+    help = "Add or update the Blow Job cocktail, its ingredients and images"
+
+    def handle(self, *args, **options):
+        info = upsert_blow_job()
+        self.stdout.write(self.style.SUCCESS(f"✔ Blow Job added/updated. Field mapping: {info}"))
@@ -0,0 +1,99 @@
+# cocktails/management/commands/set_blow_job_amounts.py
+from decimal import Decimal
+from functools import cache
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import ForeignKey, BooleanField
+
+APP = "cocktails"
+_app = apps.get_app_config(APP)
+Through = _app.get_model("CocktailIngredient")
+Ingredient = _app.get_model("Ingredient")
+Cocktail = _app.get_model("Cocktail")
+
+# 1) pick a numeric amount field (resolved on first run, not at import)
+AMOUNT_FIELDS = [
+    "amount_ml","amount","quantity_ml","quantity","input_amount","amount_input","input_value",
+    "value_ml","volume_ml","volume","measure","portion","value","dose","size","count"
+]
+
+@cache
+def candidate_amount_field():
+    numeric_types = {"DecimalField","FloatField","IntegerField","PositiveIntegerField","SmallIntegerField","PositiveSmallIntegerField"}
+    fields = list(Through._meta.concrete_fields)
+    # prefer known names
+    names = {f.name: f for f in fields}
+    for p in AMOUNT_FIELDS:
+        if p in names and names[p].get_internal_type() in numeric_types:
+            return p
+    # else: first numeric non-FK, non-boolean (seq is the line order, not an amount)
+    for f in fields:
+        if isinstance(f, (ForeignKey, BooleanField)): 
+            continue
+        if f.get_internal_type() in numeric_types and f.name not in ("id", "seq"):
+            return f.name
+    return None
+
+# 2) garnish flag: try the common names
+@cache
+def garnish_fields():
+    names = {f.name for f in Through._meta.concrete_fields}
+    return tuple(f for f in ("is_garnish", "garnish", "is_optional") if f in names)
+
+@transaction.atomic
+def run():
+    amount_field = candidate_amount_field()
+    if not amount_field:
+        raise CommandError(f"No numeric amount field on {Through.__name__}; expected one of: {', '.join(AMOUNT_FIELDS)}")
+    flags = garnish_fields()
+    bj = Cocktail.objects.get(name="Blow Job")
+    amounts = [
+        ("Amaretto", Decimal("15"), False),
+        ("Irish Cream Liqueur", Decimal("15"), False),
+        ("Whipped Cream", Decimal("5"), True),
+    ]
+    # one SELECT for all ingredients instead of a get() per name
+    ings = Ingredient.objects.in_bulk([n for n, _, _ in amounts], field_name="name")
+    missing = [n for n, _, _ in amounts if n not in ings]
+    if missing:
+        raise Ingredient.DoesNotExist(f"Ingredient(s) not found: {', '.join(missing)}")
+    rows = [(ings[n], amt, garnish) for n, amt, garnish in amounts]
+    # Same matching as get_or_create(cocktail, ingredient), but one SELECT for
+    # all rows, then one INSERT for the missing and one UPDATE for the rest
+    existing = {o.ingredient_id: o for o in
+                Through.objects.filter(cocktail=bj, ingredient__in=[r[0] for r in rows])}
+    objs, new, old = [], [], []
+    for ingredient, amt, garnish in rows:
+        obj = existing.get(ingredient.pk)
+        if obj is None:
+            obj = Through(cocktail=bj, ingredient=ingredient)
+            new.append(obj)
+        else:
+            old.append(obj)
+        objs.append(obj)
+        setattr(obj, amount_field, amt)
+        for f in flags:
+            setattr(obj, f, garnish)
+    if new:
+        Through.objects.bulk_create(new)
+    if old:
+        Through.objects.bulk_update(old, [amount_field, *flags])
+
+    # MySQL doesn't return ids from a bulk INSERT; look them up if needed
+    if any(o.pk is None for o in new):
+        ids = dict(Through.objects.filter(cocktail=bj, ingredient__in=[r[0] for r in rows])
+                   .values_list("ingredient_id", "id"))
+        for o in new:
+            o.pk = o.pk or ids.get(o.ingredient_id)
+    return amount_field, [(o.id, ingredient.name, amt, garnish)
+                          for o, (ingredient, amt, garnish) in zip(objs, rows)]
+
+
+class Command(BaseCommand):
+    help = "Set the Blow Job ingredient amounts and garnish flags"
+
+    def handle(self, *args, **options):
+        amount_field, rows = run()
+        self.stdout.write(self.style.SUCCESS(f"✔ Amounts set using field: {amount_field}"))
+        self.stdout.write(f"Rows: {rows}")
@@ -1,4 +1,6 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 
 # --- Tables ---
 
@@ -49,11 +51,25 @@ class Cocktail(models.Model):
         db_table = "cocktails"
     def __str__(self): return self.name
 
+PRICING_SETTINGS_CACHE_KEY = "pricing_settings:v1"
+PRICING_SETTINGS_CACHE_TTL = 30  # seconds
+
+class PricingSettingsManager(models.Manager):
+    def current(self):
+        """
+        The singleton settings row, cached briefly; saves/deletes drop the cache.
+        With the default LocMemCache the cache is per process: only the worker
+        that saved sees the change at once, others serve the old row (and old
+        prices) for up to PRICING_SETTINGS_CACHE_TTL seconds.
+        """
+        return cache.get_or_set(PRICING_SETTINGS_CACHE_KEY, self.first, PRICING_SETTINGS_CACHE_TTL)
+
 class PricingSettings(models.Model):
     id = models.SmallIntegerField(primary_key=True)  # always 1
     labor_cost_per_hour = models.DecimalField(max_digits=10, decimal_places=2, default=20)
     overhead_pct = models.DecimalField(max_digits=6, decimal_places=4, default=0.10)
     price_round_increment = models.DecimalField(max_digits=6, decimal_places=3, default=0.25)
+    objects = PricingSettingsManager()
     class Meta:
         managed = False
         db_table = "settings"
@@ -90,7 +106,10 @@ class CocktailAllergens(models.Model):
         db_table = "cocktail_allergens_v"
 
 class CocktailSummary(models.Model):
-    id = models.BigIntegerField(primary_key=True)  # view exposes c.id as 'id'
+    # view exposes c.id as 'id'; modelled as the link so Cocktail can join it
+    cocktail = models.OneToOneField(Cocktail, primary_key=True,
+                                    db_column="id", on_delete=models.DO_NOTHING,
+                                    related_name="summary")
     slug = models.CharField(max_length=140)
     name = models.CharField(max_length=255)
     glass_type = models.CharField(max_length=80, null=True)
@@ -107,7 +126,7 @@ class CocktailSummary(models.Model):
         db_table = "cocktail_summary_v"
     def __str__(self):
         # show a nice label in admin headers and dropdowns
-        return f"{self.name} ({self.slug})" if self.name else f"Summary #{self.id}"
+        return f"{self.name} ({self.slug})" if self.name else f"Summary #{self.pk}"
 
 
 # Convenience props for admin display
@@ -159,3 +178,10 @@ class CocktailIngredient(models.Model):
 Cocktail.cocktail_abv = property(_cocktail_abv)
 Cocktail.cocktail_price = property(_cocktail_price)
 Cocktail.cocktail_allergens = property(_cocktail_allergens)
+
+
+def _drop_pricing_settings_cache(**kwargs):
+    cache.delete(PRICING_SETTINGS_CACHE_KEY)
+
+post_save.connect(_drop_pricing_settings_cache, sender=PricingSettings)
+post_delete.connect(_drop_pricing_settings_cache, sender=PricingSettings)
@@ -1,3 +1,411 @@
-from django.test import TestCase
+# cocktails/tests.py
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, models
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from .admin import cocktails as cocktails_admin, metrics
+from .management.commands import seed_blow_job, set_blow_job_amounts
+from .models import Cocktail, CocktailIngredient, Ingredient, Unit
+from .utils import pricing
+
+
+class BarTestCase(TestCase):
+    """
+    The cocktails models are unmanaged (tables and views live in TiDB), so the
+    test database has none of them; create them as plain tables per class.
+    Every class starts from the same few ingredients.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._unmanaged = [m for m in apps.get_app_config("cocktails").get_models()
+                          if not m._meta.managed]
+        with connection.schema_editor() as editor:
+            for model in cls._unmanaged:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in reversed(cls._unmanaged):
+                editor.delete_model(model)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.rum = Ingredient.objects.create(name="Rum", abv_percent=Decimal("40"), cost_per_oz=Decimal("1.2500"))
+        cls.lime = Ingredient.objects.create(name="Lime", cost_per_oz=Decimal("0.5000"))
+        cls.bitters = Ingredient.objects.create(name="Bitters", abv_percent=Decimal("44.7"), cost_per_oz=Decimal("3.0000"))
+        cls.syrup = Ingredient.objects.create(name="Sugar Syrup", cost_per_oz=Decimal("0.2000"))
+
+
+def make_cocktail(name, slug=None, **kwargs):
+    return Cocktail.objects.create(name=name, slug=slug or name.lower().replace(" ", "-"),
+                                   created_at=timezone.now(), **kwargs)
+
+
+def make_line(cocktail, ingredient, seq, amount_input, unit_input, amount_oz="0"):
+    return CocktailIngredient.objects.create(
+        cocktail=cocktail, ingredient=ingredient, seq=seq,
+        amount_input=Decimal(amount_input), unit_input=unit_input, amount_oz=Decimal(amount_oz))
+
+
+class CocktailSaveFormsetTests(BarTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.cocktail = make_cocktail("Daiquiri")
+        self.rum_line = make_line(self.cocktail, self.rum, 1, "2", "oz", amount_oz="2")
+        self.lime_line = make_line(self.cocktail, self.lime, 2, "1", "oz", amount_oz="1")
+        self.other = make_cocktail("Mojito")
+        make_line(self.other, self.rum, 1, "2", "oz", amount_oz="2")
+
+    def post_lines(self, rows):
+        data = {"name": self.cocktail.name, "slug": self.cocktail.slug, "story_long": "",
+                "image_url": "", "video_url": "", "status": "draft", "glass_type": "",
+                "lines-TOTAL_FORMS": str(len(rows)),
+                "lines-INITIAL_FORMS": str(sum("id" in row for row in rows)),
+                "lines-MIN_NUM_FORMS": "0", "lines-MAX_NUM_FORMS": "1000"}
+        for i, row in enumerate(rows):
+            data.update({f"lines-{i}-{k}": v for k, v in row.items()})
+            data[f"lines-{i}-cocktail"] = self.cocktail.pk
+        response = self.client.post(f"/admin/cocktails/cocktail/{self.cocktail.pk}/change/", data)
+        self.assertEqual(response.status_code, 302)
+
+    def assert_add_edit_delete(self):
+        self.post_lines([
+            # edited: 60 ml -> 60 / 29.5735 oz
+            {"id": self.rum_line.pk, "seq": "1", "ingredient": self.rum.pk,
+             "amount_input": "60", "unit_input": "ml"},
+            {"id": self.lime_line.pk, "seq": "2", "ingredient": self.lime.pk,
+             "amount_input": "1", "unit_input": "oz", "DELETE": "on"},
+            {"seq": "3", "ingredient": self.syrup.pk, "amount_input": "0.75", "unit_input": "oz"},
+        ])
+        lines = CocktailIngredient.objects.filter(cocktail=self.cocktail).order_by("seq")
+        self.assertEqual([(line.ingredient_id, line.amount_oz) for line in lines],
+                         [(self.rum.pk, Decimal("2.0288")), (self.syrup.pk, Decimal("0.7500"))])
+        self.assertEqual(CocktailIngredient.objects.filter(cocktail=self.other).count(), 1)
+
+    def test_add_edit_delete_lines(self):
+        self.assert_add_edit_delete()
+
+    def test_add_edit_delete_lines_without_returned_pks(self):
+        # MySQL/TiDB: bulk_create leaves the new lines without a pk
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            self.assert_add_edit_delete()
+
+
+class ComputePriceAndAbvTests(BarTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        water = Ingredient.objects.create(name="Water")
+        credit = Ingredient.objects.create(name="Credit", abv_percent=Decimal("-10"), cost_per_oz=Decimal("-2.0000"))
+
+        cls.mixed = make_cocktail("Mixed")
+        make_line(cls.mixed, cls.rum, 1, "60", "ml", amount_oz="2.0000")  # stored amount_oz wins
+        make_line(cls.mixed, cls.rum, 2, "30", "ml")                      # 30 * 0.0338140227 oz
+        make_line(cls.mixed, cls.lime, 3, "1", "Ounce")                   # units match case-insensitively
+        make_line(cls.mixed, water, 4, "1.5", "splash")                   # unknown unit: raw value as oz
+        make_line(cls.mixed, credit, 5, "1", "oz")                        # volume only; ABV/cost <= 0 skipped
+        make_line(cls.mixed, cls.rum, 6, "-1", "oz")                      # no positive volume: dropped
+
+        cls.no_volume = make_cocktail("No volume")
+        make_line(cls.no_volume, cls.rum, 1, "0", "oz")
+        make_line(cls.no_volume, cls.lime, 2, "-2", "ml")
+
+    # total 2 + 1.014420681 + 1 + 1.5 + 1 = 6.514420681 oz
+    # pure alcohol 3.014420681 * 0.40 = 1.2057682724 oz -> 18.5092171882...%
+    # cost 3.014420681 * 1.25 + 1 * 0.50 = 4.26802585125
+    def test_hand_computed(self):
+        self.assertEqual(metrics.compute_price_and_abv(self.mixed), (Decimal("4.27"), Decimal("18.51")))
+
+    def test_unquantized(self):
+        cost, abv = metrics.compute_price_and_abv(self.mixed, quantize=False)
+        self.assertIsInstance(cost, Decimal)
+        self.assertIsInstance(abv, Decimal)
+        self.assertAlmostEqual(cost, Decimal("4.26802585125"), places=6)
+        self.assertAlmostEqual(abv, Decimal("18.5092171882"), places=6)
+
+    def test_lines_without_volume(self):
+        self.assertEqual(metrics.compute_price_and_abv(self.no_volume), (Decimal("0.00"), Decimal("0.00")))
+
+
+class CocktailSaveModelTests(BarTestCase):
+    def setUp(self):
+        self.model_admin = admin.site._registry[Cocktail]
+        self.request = RequestFactory().post("/")
+        make_cocktail("Daiquiri", slug="daiquiri")
+
+    def test_slug_collision_is_retried_with_next_free_suffix(self):
+        # Both saves passed validate_unique; the second hits the unique index
+        obj = Cocktail(name="Daiquiri", slug="daiquiri")
+        self.model_admin.save_model(self.request, obj, None, False)
+        obj.refresh_from_db()
+        self.assertEqual(obj.slug, "daiquiri-2")
+        self.assertEqual(Cocktail.objects.filter(slug__startswith="daiquiri").count(), 2)
+
+    def test_other_integrity_errors_are_not_retried(self):
+        obj = Cocktail(name=None, slug="no-name")
+        with mock.patch.object(self.model_admin, "_ensure_unique_slug") as ensure:
+            with self.assertRaises(IntegrityError):
+                self.model_admin.save_model(self.request, obj, None, False)
+        ensure.assert_not_called()
+        self.assertFalse(Cocktail.objects.filter(slug="no-name").exists())
+
+
+class EnsureUniqueSlugTests(BarTestCase):
+    def setUp(self):
+        self.model_admin = admin.site._registry[Cocktail]
+
+    def test_free_slug(self):
+        self.assertEqual(self.model_admin._ensure_unique_slug("Mojito"), "mojito")
+
+    def test_next_free_suffix(self):
+        make_cocktail("Mojito")
+        make_cocktail("Mojito 2", slug="mojito-2")
+        self.assertEqual(self.model_admin._ensure_unique_slug("Mojito"), "mojito-3")
+
+    def test_mixed_case_slug_is_taken(self):
+        # The _ci unique index rejects "mojito" next to a hand-entered "Mojito"
+        make_cocktail("Mojito", slug="Mojito")
+        self.assertEqual(self.model_admin._ensure_unique_slug("Mojito"), "mojito-2")
+
+    def test_year_suffix_does_not_set_the_next_number(self):
+        make_cocktail("Mojito")
+        make_cocktail("Mojito 2024", slug="mojito-2024")
+        self.assertEqual(self.model_admin._ensure_unique_slug("Mojito"), "mojito-2")
+
+    def test_own_slug_is_free(self):
+        own = make_cocktail("Mojito")
+        self.assertEqual(self.model_admin._ensure_unique_slug("Mojito", instance_id=own.pk), "mojito")
+
+
+def old_compute_totals(cocktail):
+    """The per-row loop compute_totals replaced; the reference for its results."""
+    total_oz = pure = cost = Decimal("0")
+    for r in CocktailIngredient.objects.filter(cocktail=cocktail).select_related("ingredient"):
+        oz = pricing._to_decimal(r.amount_oz)
+        if oz == 0:
+            oz = pricing._amount_to_oz(r.amount_input, r.unit_input)
+        total_oz += oz
+        pure += oz * pricing._to_decimal(r.ingredient.abv_percent) / Decimal("100")
+        cost += oz * pricing._to_decimal(r.ingredient.cost_per_oz)
+    abv = (pure / total_oz * Decimal("100")) if total_oz else Decimal("0")
+    return (total_oz, abv.quantize(Decimal("0.01"), rounding="ROUND_HALF_UP"),
+            cost.quantize(Decimal("0.01"), rounding="ROUND_HALF_UP"))
+
+
+class ComputeTotalsTests(BarTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # stored amount_oz wins over amount_input/unit_input
+        cls.stored = make_cocktail("Stored")
+        make_line(cls.stored, cls.rum, 1, "60", "ml", amount_oz="2.0288")
+        make_line(cls.stored, cls.lime, 2, "1", "oz", amount_oz="0.7500")
+
+        # amount_oz == 0 falls back to the unit rule; units match case-insensitively,
+        # unknown units count as no volume
+        cls.converted = make_cocktail("Converted")
+        make_line(cls.converted, cls.rum, 1, "2", "OZ")
+        make_line(cls.converted, cls.bitters, 2, "3", "Dash")
+        make_line(cls.converted, cls.lime, 3, "1", "wedge")
+        make_line(cls.converted, cls.lime, 4, "5", "splash")
+
+        # 0.0150 dash = 0.00045 oz, an exact tie at 4dp
+        cls.tie = make_cocktail("Tie")
+        make_line(cls.tie, cls.bitters, 1, "0.0150", "dash")
+        make_line(cls.tie, cls.rum, 2, "1", "oz")
+
+        cls.whole = make_cocktail("Whole")
+        make_line(cls.whole, cls.rum, 1, "2", "oz", amount_oz="2")
+
+        cls.empty = make_cocktail("Empty")
+
+    def test_matches_old_per_row_rule(self):
+        for cocktail in (self.stored, self.converted, self.whole, self.empty):
+            with self.subTest(cocktail=cocktail.name):
+                self.assertEqual(pricing.compute_totals(cocktail), old_compute_totals(cocktail))
+
+    def test_stored_amount_oz(self):
+        # 2.0288 oz rum @ 40% + 0.75 oz lime; cost 2.0288*1.25 + 0.75*0.5 = 2.911
+        self.assertEqual(pricing.compute_totals(self.stored),
+                         (Decimal("2.7788"), Decimal("29.20"), Decimal("2.91")))
+
+    def test_converted_units(self):
+        # 2 oz rum + 3 dash * 0.03 = 0.09 oz bitters; wedge is 0, "splash" is unknown
+        # pure alcohol 0.8 + 0.04023 = 0.84023 oz of 2.09 oz; cost 2.5 + 0.27
+        self.assertEqual(pricing.compute_totals(self.converted),
+                         (Decimal("2.0900"), Decimal("40.20"), Decimal("2.77")))
+
+    def test_converted_volume_ties_round_away_from_zero(self):
+        # SQL ROUND(); the old Decimal loop gave 1.0004 (half-even)
+        total_oz, _, _ = pricing.compute_totals(self.tie)
+        self.assertEqual(total_oz, Decimal("1.0005"))
+
+    def test_whole_number_amounts(self):
+        # 2 * 40 / 100 would be integer division on SQLite
+        self.assertEqual(pricing.compute_totals(self.whole),
+                         (Decimal("2.0000"), Decimal("40.00"), Decimal("2.50")))
+
+    def test_no_lines(self):
+        self.assertEqual(pricing.compute_totals(self.empty), (Decimal("0"), Decimal("0"), Decimal("0")))
+
+
+class SeedBlowJobTests(BarTestCase):
+    def links(self):
+        return list(CocktailIngredient.objects.filter(cocktail__name="Blow Job")
+                    .order_by("ingredient__name")
+                    .values_list("ingredient__name", "seq", "amount_input", "amount_oz", "unit_input", "is_optional"))
+
+    def test_seed_is_idempotent(self):
+        call_command("seed_blow_job", stdout=StringIO())
+        # ml amounts, with the ounces the admin would store (x / 29.5735, 4dp)
+        expected = [
+            ("Amaretto", 1, Decimal("15"), Decimal("0.5072"), "ml", False),
+            ("Irish Cream Liqueur", 1, Decimal("15"), Decimal("0.5072"), "ml", False),
+            ("Whipped Cream", 1, Decimal("5"), Decimal("0.1691"), "ml", True),
+        ]
+        self.assertEqual(self.links(), expected)
+
+        # An edited line keeps its seq (same unique key) and gets the seeded values back
+        CocktailIngredient.objects.filter(ingredient__name="Amaretto").update(
+            seq=7, amount_input=Decimal("1"), is_optional=True)
+        call_command("seed_blow_job", stdout=StringIO())
+        expected[0] = ("Amaretto", 7, Decimal("15"), Decimal("0.5072"), "ml", False)
+        self.assertEqual(self.links(), expected)
+        self.assertEqual(Cocktail.objects.filter(name="Blow Job").count(), 1)
+        self.assertEqual(Cocktail.objects.get(name="Blow Job").image_url, seed_blow_job.BLOW_JOB_IMG)
+        self.assertEqual(dict(Ingredient.objects.filter(name__in=seed_blow_job.INGR_IMG)
+                              .values_list("name", "image_url")), seed_blow_job.INGR_IMG)
+
+    def test_schema(self):
+        self.assertIs(seed_blow_job.find_through_model(), CocktailIngredient)
+        self.assertIs(seed_blow_job._find_unit(), Unit)
+        self.assertEqual(seed_blow_job._resolve_schema(), seed_blow_job.Schema(
+            cocktail_image_field="image_url", ingredient_image_field="image_url",
+            amount_field="amount_input", is_garnish_field="is_optional",
+            unit_field="unit_input", unit_targets_name=False))
+
+    def test_no_amount_field_fails(self):
+        schema = seed_blow_job._resolve_schema()._replace(amount_field=None)
+        with mock.patch.object(seed_blow_job, "_resolve_schema", return_value=schema):
+            with self.assertRaisesMessage(CommandError, "No amount field on CocktailIngredient"):
+                call_command("seed_blow_job", stdout=StringIO())
+
+    def test_defaults_follow_field_mro(self):
+        default_for_field = seed_blow_job.default_for_field
+        self.assertEqual(default_for_field(models.PositiveSmallIntegerField()), 0)
+        self.assertEqual(default_for_field(models.SlugField()), "")
+        self.assertEqual(default_for_field(models.IntegerField(default=5)), 5)
+        self.assertIsNone(default_for_field(models.JSONField()))
+
+    def test_upsert_kwargs(self):
+        upsert_kwargs = seed_blow_job.upsert_kwargs
+        self.assertEqual(upsert_kwargs(["name"], []), {"ignore_conflicts": True})
+        features = type(connection.features)
+        with mock.patch.object(features, "supports_update_conflicts_with_target", True):
+            self.assertEqual(upsert_kwargs(["name"], ["image_url"]),
+                             {"update_conflicts": True, "update_fields": ["image_url"], "unique_fields": ["name"]})
+        # MySQL/TiDB reject an explicit conflict target
+        with mock.patch.object(features, "supports_update_conflicts_with_target", False):
+            self.assertEqual(upsert_kwargs(["name"], ["image_url"]),
+                             {"update_conflicts": True, "update_fields": ["image_url"]})
+
+
+class SetBlowJobAmountsTests(BarTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.blow_job = make_cocktail("Blow Job")
+        cls.amaretto, cls.irish_cream, cls.whipped_cream = (
+            Ingredient.objects.create(name=n) for n in ("Amaretto", "Irish Cream Liqueur", "Whipped Cream"))
+
+    def links(self):
+        return list(CocktailIngredient.objects.filter(cocktail=self.blow_job)
+                    .order_by("ingredient__name")
+                    .values_list("id", "ingredient__name", "seq", "amount_input", "is_optional"))
+
+    def assert_created(self):
+        amount_field, rows = set_blow_job_amounts.run()
+        self.assertEqual(amount_field, "amount_input")
+        links = self.links()
+        self.assertEqual([link[1:] for link in links], [
+            ("Amaretto", 1, Decimal("15"), False),
+            ("Irish Cream Liqueur", 1, Decimal("15"), False),
+            ("Whipped Cream", 1, Decimal("5"), True),
+        ])
+        # returned ids are the stored rows', also where bulk INSERT returns none
+        self.assertEqual([row[0] for row in rows], [link[0] for link in links])
+
+    def test_creates_missing_links(self):
+        self.assert_created()
+
+    def test_creates_missing_links_without_returned_pks(self):
+        # MySQL/TiDB: bulk_create leaves the new lines without a pk
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            self.assert_created()
+
+    def test_updates_existing_links(self):
+        amaretto = make_line(self.blow_job, self.amaretto, 3, "1", "ml")
+        CocktailIngredient.objects.filter(pk=amaretto.pk).update(is_optional=True)
+        call_command("set_blow_job_amounts", stdout=StringIO())
+        links = self.links()
+        self.assertEqual(len(links), 3)
+        # the existing row is updated in place, seq untouched
+        self.assertEqual(links[0], (amaretto.pk, "Amaretto", 3, Decimal("15"), False))
+        self.assertEqual([link[1:] for link in links[1:]], [
+            ("Irish Cream Liqueur", 1, Decimal("15"), False),
+            ("Whipped Cream", 1, Decimal("5"), True),
+        ])
+
+    def test_amount_field(self):
+        # not seq, the first numeric column, which the fallback used to pick
+        self.assertEqual(set_blow_job_amounts.candidate_amount_field(), "amount_input")
+
+    def test_no_amount_field_fails(self):
+        with mock.patch.object(set_blow_job_amounts, "candidate_amount_field", return_value=None):
+            with self.assertRaisesMessage(CommandError, "No numeric amount field on CocktailIngredient; "
+                                                        "expected one of: amount_ml, amount, "):
+                call_command("set_blow_job_amounts", stdout=StringIO())
+
+
+class BackfillAmountOzTests(BarTestCase):
+    def setUp(self):
+        self.cocktail = make_cocktail("Daiquiri")
+        self.lines = [
+            make_line(self.cocktail, self.rum, 1, "60", "ml"),
+            make_line(self.cocktail, self.lime, 2, "22.5", "ML"),
+            make_line(self.cocktail, self.syrup, 3, "0.75", "oz"),
+            make_line(self.cocktail, self.bitters, 4, "2", "dash", amount_oz="1"),
+        ]
+
+    def test_matches_admin_storage(self):
+        out = StringIO()
+        call_command("backfill_amount_oz", stdout=out)
+        self.assertIn("Updated rows: 4", out.getvalue())
+        # what the admin's save stores for the same inputs
+        expected = []
+        for line in self.lines:
+            line.amount_oz = cocktails_admin._to_oz(line.amount_input, line.unit_input)
+            line.save(update_fields=["amount_oz"])
+            line.refresh_from_db()
+            expected.append(line.amount_oz)
+        self.assertEqual(expected, [Decimal("2.0288"), Decimal("0.7608"), Decimal("0.7500"), Decimal("0")])
+
+        call_command("backfill_amount_oz", stdout=out)
+        self.assertIn("Updated rows: 0", out.getvalue())
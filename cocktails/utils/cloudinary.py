@@ -0,0 +1,15 @@
+# cocktails/utils/cloudinary.py
+from functools import lru_cache
+
+_CLOUDINARY_PREFIX = "https://res.cloudinary.com/"
+
+@lru_cache(maxsize=4096)
+def cloudinary_thumb(url, height):
+    """
+    Return a Cloudinary delivery URL scaled to `height` px, in whatever
+    format/quality the browser handles best (f_auto,q_auto).
+    Non-Cloudinary (or already transformed) URLs are returned unchanged.
+    """
+    if not url or not url.startswith(_CLOUDINARY_PREFIX) or "/upload/v" not in url:
+        return url
+    return url.replace("/upload/", f"/upload/c_scale,h_{height},f_auto,q_auto/", 1)
@@ -1,6 +1,9 @@
 # cocktails/utils/pricing.py
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 from django.apps import apps
+from django.db.models import Case, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Lower, Round
 
 # Convert admin "unit_input" into ounces for cost/abv math
 _UNIT_TO_OZ = {
@@ -11,9 +14,22 @@ _UNIT_TO_OZ = {
     "wedge": Decimal("0"),
 }
 
+# Shared Decimal constants (parsed once, not per call)
+_D0, _D1, _D100 = Decimal("0"), Decimal("1"), Decimal("100")
+_Q2, _Q4 = Decimal("0.01"), Decimal("0.0001")  # cents / line-volume precision
+_PCT = Decimal("0.01")  # percent -> fraction
+
+@lru_cache(maxsize=None)
+def _model(name):
+    # Resolved lazily (this module may be imported before the registry is ready)
+    return apps.get_app_config("cocktails").get_model(name)
+
 def _to_decimal(val, default="0"):
     if val is None:
         return Decimal(default)
+    # DecimalField/aggregate results are already Decimal; skip the str() re-parse
+    if isinstance(val, Decimal):
+        return val
     try:
         return Decimal(str(val))
     except Exception:
@@ -21,45 +37,68 @@ def _to_decimal(val, default="0"):
 
 def _amount_to_oz(amount_input, unit_input):
     unit = (unit_input or "").lower()
-    mult = _UNIT_TO_OZ.get(unit, Decimal("0"))
-    return (_to_decimal(amount_input) * mult).quantize(Decimal("0.0001"))
+    mult = _UNIT_TO_OZ.get(unit, _D0)
+    return (_to_decimal(amount_input) * mult).quantize(_Q4)
+
+_OZ_FIELD = DecimalField(max_digits=20, decimal_places=6)
+
+def _line_oz():
+    """
+    SQL twin of the per-line rule (see _amount_to_oz): stored amount_oz when non-zero,
+    otherwise amount_input converted by unit and rounded to 4dp. SQL ROUND() sends
+    ties away from zero where _amount_to_oz rounds half-even, so an exact tie
+    (0.0150 dash = 0.00045 oz) gives 0.0005 here and 0.0004 there.
+    """
+    converted = Case(
+        *(When(unit_lc=unit, then=F("amount_input") * Value(mult))
+          for unit, mult in _UNIT_TO_OZ.items() if mult),
+        default=Value(_D0),
+        output_field=_OZ_FIELD,
+    )
+    return Case(
+        When(Q(amount_oz=0) | Q(amount_oz__isnull=True), then=Round(converted, 4)),
+        default=F("amount_oz"),
+        output_field=_OZ_FIELD,
+    )
 
 def compute_totals(cocktail):
     """
     Returns: (total_volume_oz, abv_percent, ingredients_cost)
     """
-    CocktailIngredient = apps.get_model("cocktails", "CocktailIngredient")
-    rows = (CocktailIngredient.objects
-            .filter(cocktail=cocktail)
-            .select_related("ingredient"))
-
-    total_oz = Decimal("0")
-    pure_alcohol_oz = Decimal("0")
-    ing_cost = Decimal("0")
-
-    for r in rows:
-        # Prefer explicit amount_oz if present; otherwise convert
-        oz = _to_decimal(getattr(r, "amount_oz", None))
-        if oz == 0:
-            oz = _amount_to_oz(getattr(r, "amount_input", None),
-                               getattr(r, "unit_input", ""))
-
-        ing = r.ingredient
-        abv = _to_decimal(getattr(ing, "abv_percent", None))
-        cost_per_oz = _to_decimal(getattr(ing, "cost_per_oz", None))
-
-        total_oz += oz
-        pure_alcohol_oz += (oz * abv / Decimal("100"))
-        ing_cost += (oz * cost_per_oz)
-
-    abv_percent = (pure_alcohol_oz / total_oz * Decimal("100")) if total_oz else Decimal("0")
-    abv_percent = abv_percent.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    ing_cost = ing_cost.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    zero = Value(_D0)
+    agg = (_model("CocktailIngredient").objects
+           .filter(cocktail=cocktail)
+           .alias(unit_lc=Lower("unit_input"))
+           .annotate(oz=_line_oz())
+           .aggregate(
+               total_oz=Sum("oz"),
+               # * 0.01, not / 100: SQLite divides whole-number operands as integers
+               pure_alcohol_oz=Sum(F("oz") * Coalesce("ingredient__abv_percent", zero) * Value(_PCT),
+                                   output_field=_OZ_FIELD),
+               ing_cost=Sum(F("oz") * Coalesce("ingredient__cost_per_oz", zero), output_field=_OZ_FIELD),
+           ))
+
+    # every line is 4dp, so the sum is too; quantize away backend float noise
+    total_oz = _to_decimal(agg["total_oz"]).quantize(_Q4)
+    pure_alcohol_oz = _to_decimal(agg["pure_alcohol_oz"])
+    ing_cost = _to_decimal(agg["ing_cost"])
+
+    abv_percent = (pure_alcohol_oz / total_oz * _D100) if total_oz else _D0
+    abv_percent = abv_percent.quantize(_Q2, rounding=ROUND_HALF_UP)
+    ing_cost = ing_cost.quantize(_Q2, rounding=ROUND_HALF_UP)
     return total_oz, abv_percent, ing_cost
 
+@lru_cache(maxsize=None)
+def _field_set(model):
+    # Model shape is fixed for the process; introspect once
+    return frozenset(f.name for f in model._meta.concrete_fields)
+
 def _get_ps_value(ps, *names, default="0"):
+    if ps is None:
+        return Decimal(default)
+    fields = _field_set(type(ps))
     for n in names:
-        if hasattr(ps, n):
+        if n in fields:
             return _to_decimal(getattr(ps, n), default)
     return Decimal(default)
 
@@ -70,14 +109,13 @@ def compute_price(cocktail):
     """
     _, _, ingredients_cost = compute_totals(cocktail)
 
-    PricingSettings = apps.get_model("cocktails", "PricingSettings")
-    ps = PricingSettings.objects.first()  # ok for admin list
+    ps = _model("PricingSettings").objects.current()
 
     labor = _get_ps_value(ps, "labor_per_cocktail", "labor", "labor_cost")
     markup = _get_ps_value(ps, "markup_percent", "markup")
     overhead = _get_ps_value(ps, "overhead_percent", "overhead")
 
     subtotal = ingredients_cost + labor
-    factor = Decimal("1") + (markup + overhead) / Decimal("100")
-    price = (subtotal * factor).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    factor = _D1 + (markup + overhead) / _D100
+    price = (subtotal * factor).quantize(_Q2, rounding=ROUND_HALF_UP)
     return price
@@ -87,6 +87,9 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT", "4000"),
+        # Reuse the TLS connection across requests instead of reconnecting each time
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {
             "ssl": {"ca": str(BASE_DIR / "shakesite" / "certs" / "isrgrootx1.pem")},
             "charset": "utf8mb4",